@@ -1,14 +1,242 @@
-from django.contrib import admin
-from .models import Project, Task
+import json
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import QueryDict
+from django.utils.functional import cached_property
+from .models import ArchivedTask, Project, Task
+from .sharding import SHARDED_APP_LABEL, all_shards
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the query planner's row estimate for large results.
+
+    An exact COUNT(*) has to visit every matching row. Once PostgreSQL
+    estimates more than `exact_count_limit` rows and a count capped just past
+    that limit confirms it, the estimate is used for the page links instead;
+    smaller results and other databases are counted exactly.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        """Return the estimated row count, or the exact one for small results."""
+        estimate = self._estimate_count()
+        if estimate is None or estimate < self.exact_count_limit:
+            return super().count
+        # Estimates for searches and selective filters can be far too high,
+        # which would produce empty pages, so confirm with a bounded count.
+        bounded = self.object_list[:self.exact_count_limit + 1].count()
+        if bounded <= self.exact_count_limit:
+            return bounded
+        return max(estimate, bounded)
+
+    def _estimate_count(self):
+        """Return the planner's row estimate for the object list, if available."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        # Compile for the queryset's own database; sql_with_params() would
+        # always use the default connection.
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def admin_shard(request):
+    """
+    Return the shard an admin request is browsing.
+
+    Changelists carry it as ?shard=; change, add and delete pages get it
+    from the changelist filters the admin preserves in their URLs.
+    """
+    shard = request.GET.get(ShardFilter.parameter_name)
+    if shard is None:
+        preserved = QueryDict(request.GET.get('_changelist_filters', ''))
+        shard = preserved.get(ShardFilter.parameter_name)
+    return shard if shard in all_shards() else 'default'
+
+
+class ShardAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete widget that searches the shard being browsed."""
+
+    def __init__(self, field, admin_site, shard, **kwargs):
+        self.shard = shard
+        super().__init__(field, admin_site, using=shard, **kwargs)
+
+    def get_url(self):
+        return f'{super().get_url()}?{ShardFilter.parameter_name}={self.shard}'
+
+
+def autocomplete_widget(field, admin_site, request):
+    """Return an autocomplete widget for `field`, bound to the browsed shard if it is sharded."""
+    if field.remote_field.model._meta.app_label == SHARDED_APP_LABEL:
+        return ShardAutocompleteSelect(field, admin_site, admin_shard(request))
+    return AutocompleteSelect(field, admin_site)
+
+
+class ShardFilter(admin.SimpleListFilter):
+    """List filter that switches a changelist between shard databases."""
+
+    title = 'shard'
+    parameter_name = 'shard'
+
+    def lookups(self, request, model_admin):
+        return [(alias, alias) for alias in all_shards()]
+
+    def queryset(self, request, queryset):
+        # ShardedAdmin.get_queryset has already picked the database.
+        return queryset
+
+    def choices(self, changelist):
+        current = self.value() if self.value() in all_shards() else 'default'
+        for alias, title in self.lookup_choices:
+            yield {
+                'selected': alias == current,
+                # Ids differ between shards, so start each one unfiltered.
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: alias}, remove=list(changelist.params)
+                ),
+                'display': title,
+            }
+
+
+class AutocompleteFilter(admin.SimpleListFilter):
+    """
+    List filter that picks a related object through the admin autocomplete widget.
+
+    Unlike the default related-field filter it never renders every related
+    object into the sidebar. The related model's admin must define
+    search_fields.
+    """
+
+    template = 'admin/api/autocomplete_filter.html'
+    field_name = None
+
+    def __init__(self, request, params, model, model_admin):
+        self.parameter_name = f'{self.field_name}__id__exact'
+        super().__init__(request, params, model, model_admin)
+        model_field = model._meta.get_field(self.field_name)
+        widget = autocomplete_widget(model_field, model_admin.admin_site, request)
+        self.form_field = forms.ModelChoiceField(
+            queryset=model_field.remote_field.model._default_manager.using(widget.db),
+            widget=widget,
+            required=False,
+        )
+
+    def has_output(self):
+        return True
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            return queryset.filter(**{self.parameter_name: self.value()})
+        except (ValueError, ValidationError) as e:
+            raise IncorrectLookupParameters(e)
+
+    def choices(self, changelist):
+        query_string = changelist.get_query_string(remove=[self.parameter_name])
+        yield {
+            'selected': self.value() is None,
+            'query_string': query_string,
+            'display': 'All',
+            'widget': self.form_field.widget.render(
+                self.parameter_name,
+                self.value(),
+                attrs={'class': 'autocomplete-filter', 'data-filter-base': query_string},
+            ),
+        }
+
+
+class ProjectFilter(AutocompleteFilter):
+    title = 'project'
+    field_name = 'project'
+
+
+class OwnerFilter(AutocompleteFilter):
+    title = 'owner'
+    field_name = 'owner'
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin defaults that keep changelists fast on very large tables."""
+
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, type) and issubclass(list_filter, AutocompleteFilter):
+                model_field = self.model._meta.get_field(list_filter.field_name)
+                media += AutocompleteSelect(model_field, self.admin_site).media
+                media += forms.Media(js=['admin/js/jquery.init.js', 'api/js/autocomplete_filter.js'])
+        return media
+
+
+class ShardedAdmin(LargeTableAdmin):
+    """
+    Admin for a sharded model, browsing one shard at a time.
+
+    With several shards configured the changelist gets a shard filter, and
+    every page reads and writes the selected shard ('default' otherwise).
+    """
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).using(admin_shard(request))
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if len(all_shards()) > 1:
+            list_filter = [*list_filter, ShardFilter]
+        return list_filter
+
+    def get_list_select_related(self, request):
+        """Only join models stored on the same shard; users live on default."""
+        shard = admin_shard(request)
+        return [
+            name for name in super().get_list_select_related(request)
+            if shard == 'default'
+            or self.model._meta.get_field(name).related_model._meta.app_label == SHARDED_APP_LABEL
+        ]
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.remote_field.model._meta.app_label == SHARDED_APP_LABEL:
+            kwargs.setdefault('using', admin_shard(request))
+            if db_field.name in self.get_autocomplete_fields(request):
+                kwargs.setdefault('widget', autocomplete_widget(db_field, self.admin_site, request))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ShardedAdmin):
     """Admin interface for Project model."""
     
     list_display = ['name', 'owner', 'created_at']
-    list_filter = ['created_at', 'owner']
-    search_fields = ['name', 'description', 'owner__username']
+    list_filter = ['created_at', OwnerFilter]
+    list_select_related = ['owner']
+    search_fields = ['name']
+    autocomplete_fields = ['owner']
     readonly_fields = ['created_at']
     fieldsets = (
         ('Basic Information', {
@@ -19,14 +247,53 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
 
+    def delete_model(self, request, obj):
+        """Delete the project in chunks, or queue it when it has many tasks."""
+        self._delete_projects(request, [obj])
+
+    def delete_queryset(self, request, queryset):
+        """Delete each selected project in chunks, queueing the large ones."""
+        self._delete_projects(request, queryset)
+
+    def _delete_projects(self, request, projects):
+        """Delete like ProjectViewSet.destroy and report which projects were queued."""
+        queued = []
+        for project in projects:
+            if project.has_many_tasks():
+                project.request_deletion()
+                queued.append(project.name)
+            else:
+                project.purge()
+        if queued:
+            self.message_user(
+                request,
+                f"Queued for background deletion by purge_deleted_projects: {', '.join(queued)}.",
+                messages.WARNING,
+            )
+
+    def get_deleted_objects(self, objs, request):
+        """Summarise cascaded tasks by count instead of loading and listing each one."""
+        projects = list(objs)
+        deleted_objects = [f"{Project._meta.verbose_name}: {project}" for project in projects]
+        model_count = {Project._meta.verbose_name_plural: len(projects)}
+        perms_needed = set()
+        for model in (Task, ArchivedTask):
+            count = model.objects.using(admin_shard(request)).filter(project__in=projects).count()
+            model_count[model._meta.verbose_name_plural] = count
+            if count and not request.user.has_perm(f'api.delete_{model._meta.model_name}'):
+                perms_needed.add(model._meta.verbose_name)
+        return deleted_objects, model_count, perms_needed, []
+
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(ShardedAdmin):
     """Admin interface for Task model."""
     
     list_display = ['title', 'project', 'status', 'priority', 'due_date', 'created_at']
-    list_filter = ['status', 'priority', 'created_at', 'due_date', 'project']
-    search_fields = ['title', 'description', 'project__name']
+    list_filter = ['status', 'priority', 'created_at', 'due_date', ProjectFilter]
+    list_select_related = ['project']
+    search_fields = ['title']
+    autocomplete_fields = ['project']
     readonly_fields = ['created_at', 'updated_at']
     fieldsets = (
         ('Basic Information', {
@@ -39,3 +306,19 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(ShardedAdmin):
+    """Read-only admin interface for archived tasks."""
+
+    list_display = ['title', 'project', 'priority', 'created_at', 'archived_at']
+    list_filter = ['archived_at', ProjectFilter]
+    list_select_related = ['project']
+    search_fields = ['title']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,25 @@
+from rest_framework import filters
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """Ordering filter that maps public field names onto indexed columns."""
+
+    # Each alias expands to the trailing columns of a composite index so the
+    # requested ordering can be served straight from the index.
+    ordering_aliases = {
+        'priority': ['priority_rank', 'created_at'],
+        # Ties only arise transiently, but id keeps the order deterministic.
+        'rank': ['rank', 'id'],
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """Expand aliased ordering terms, keeping the requested direction."""
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        expanded = []
+        for term in ordering:
+            prefix = '-' if term.startswith('-') else ''
+            columns = self.ordering_aliases.get(term.lstrip('-'), [term.lstrip('-')])
+            expanded.extend(prefix + column for column in columns)
+        return expanded
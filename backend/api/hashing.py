@@ -0,0 +1,51 @@
+"""
+Password hashing on a small dedicated thread pool.
+
+Password hashers are deliberately CPU-heavy. Running them on a pool of
+PASSWORD_HASHING_WORKERS threads caps how much CPU a burst of signups and
+logins can take from task traffic. PBKDF2 releases the GIL, so the pool
+still hashes in parallel.
+
+The cap is per process: each server process has its own pool, so the
+total is PASSWORD_HASHING_WORKERS times the number of processes, and the
+default setting divides the cores by WEB_CONCURRENCY for that reason. The
+requesting thread still waits for its hash, so this only helps threaded
+servers, where requests on other threads keep running; a single-threaded
+worker is busy either way.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+@lru_cache(maxsize=None)
+def _executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_WORKERS,
+        thread_name_prefix='password-hashing',
+    )
+
+
+def make_password(raw_password):
+    """Hash a password on the hashing pool."""
+    return _executor().submit(hashers.make_password, raw_password).result()
+
+
+def check_password(user, raw_password):
+    """
+    Check a user's password on the hashing pool.
+
+    When the preferred hasher or its work factor has changed since the
+    password was stored, a correct password is rehashed and saved. The
+    database write happens on the calling thread.
+    """
+    needs_rehash = []
+    is_correct = _executor().submit(
+        hashers.check_password, raw_password, user.password, needs_rehash.append
+    ).result()
+    if is_correct and needs_rehash:
+        user.password = make_password(raw_password)
+        user.save(update_fields=['password'])
+    return is_correct
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Task
+from api.sharding import all_shards
+
+
+class Command(BaseCommand):
+    """Move old done tasks out of the tasks table on every shard."""
+
+    help = 'Archive done tasks that have not been updated for --older-than-days days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=None,
+            help='Archive done tasks not updated for this many days (default: TASK_ARCHIVE_AFTER_DAYS).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Tasks to move per transaction (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        days = options['older_than_days']
+        if days is None:
+            days = settings.TASK_ARCHIVE_AFTER_DAYS
+        before = timezone.now() - timedelta(days=days)
+        count = 0
+        for alias in all_shards():
+            count += Task.archive_done(before, chunk_size=options['chunk_size'], using=alias)
+        self.stdout.write(self.style.SUCCESS(f'Archived {count} task(s).'))
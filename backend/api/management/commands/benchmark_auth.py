@@ -0,0 +1,64 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from api.views import signup
+
+
+class Command(BaseCommand):
+    """Measure signup and login throughput on this machine."""
+
+    help = (
+        'Run signups and logins through the API views one at a time inside a '
+        'rolled-back transaction and report requests per second per core.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=20,
+            help='Signups and logins to run (default: 20).',
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        factory = APIRequestFactory()
+        login = TokenObtainPairView.as_view()
+        password = 'Bench-Pass-123!'
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            for i in range(count):
+                request = factory.post(
+                    '/api/auth/signup/',
+                    {'username': f'benchmark-{i}', 'password': password},
+                    format='json',
+                )
+                response = signup(request)
+                if response.status_code != 201:
+                    raise CommandError(f'Signup failed: {response.data}')
+            signup_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for i in range(count):
+                request = factory.post(
+                    '/api/auth/token/',
+                    {'username': f'benchmark-{i}', 'password': password},
+                    format='json',
+                )
+                response = login(request)
+                if response.status_code != 200:
+                    raise CommandError(f'Login failed: {response.data}')
+            login_seconds = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        # Requests run one at a time, so each rate is what a single core delivers.
+        self.stdout.write(f'CPU cores available: {os.cpu_count()}')
+        self.stdout.write(f'Signups per second per core: {count / signup_seconds:.1f}')
+        self.stdout.write(f'Logins per second per core: {count / login_seconds:.1f}')
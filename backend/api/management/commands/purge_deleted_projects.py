@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Project
+from api.sharding import all_shards
+
+
+class Command(BaseCommand):
+    """Delete projects queued for background deletion."""
+
+    help = 'Delete projects whose deletion was requested, removing their tasks in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Tasks to delete per statement (default: PROJECT_DELETE_CHUNK_SIZE).',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for alias in all_shards():
+            projects = Project.objects.using(alias).filter(
+                deletion_requested_at__isnull=False
+            ).order_by('deletion_requested_at')
+            for project in projects.iterator():
+                project.purge(chunk_size=options['chunk_size'])
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} project(s).'))
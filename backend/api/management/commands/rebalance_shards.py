@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import ArchivedTask, Project, Task
+from api.sharding import all_shards, shard_for_owner
+
+
+class Command(BaseCommand):
+    """Move each owner's projects and tasks onto the shard TASK_SHARDS assigns them."""
+
+    help = (
+        "Copy projects and tasks (archived ones included) whose owner hashes to a different shard onto that "
+        "shard, keeping their ids, then delete them from the old one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Tasks to copy per batch (default: 2000).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report which owners would move.',
+        )
+
+    def handle(self, *args, **options):
+        moved = 0
+        for source in all_shards():
+            owner_ids = (
+                Project.objects.using(source)
+                .order_by()
+                .values_list('owner_id', flat=True)
+                .distinct()
+            )
+            for owner_id in list(owner_ids):
+                target = shard_for_owner(owner_id)
+                if target == source:
+                    continue
+                self.stdout.write(f'Owner {owner_id}: {source} -> {target}')
+                if not options['dry_run']:
+                    self.move_owner(owner_id, source, target, options['chunk_size'])
+                moved += 1
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} owner(s).'))
+
+    def move_owner(self, owner_id, source, target, chunk_size):
+        """
+        Copy one owner's rows to `target`, then delete them from `source`.
+
+        The target transaction commits first, so a failure part way leaves the
+        rows on both shards rather than on neither; re-running the command
+        skips rows already copied and finishes the move.
+        """
+        with transaction.atomic(using=source), transaction.atomic(using=target):
+            projects = list(Project.objects.using(source).filter(owner_id=owner_id))
+            Project.objects.using(target).bulk_create(projects, ignore_conflicts=True)
+
+            for model in (Task, ArchivedTask):
+                tasks = model.objects.using(source).filter(project__owner_id=owner_id).order_by('pk')
+                last_pk = 0
+                while True:
+                    chunk = list(tasks.filter(pk__gt=last_pk)[:chunk_size])
+                    if not chunk:
+                        break
+                    model.objects.using(target).bulk_create(chunk, ignore_conflicts=True)
+                    last_pk = chunk[-1].pk
+                model.objects.using(source).filter(project__owner_id=owner_id).delete()
+            Project.objects.using(source).filter(owner_id=owner_id).delete()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Length
+
+from api.models import Task
+from api.sharding import all_shards
+
+
+class Command(BaseCommand):
+    """Rebalance board columns whose rank keys have grown long."""
+
+    help = 'Rewrite task ranks with short keys in columns where any key exceeds --max-length.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-length',
+            type=int,
+            default=24,
+            help='Rebalance a column once any of its rank keys is longer than this (default: 24).',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for alias in all_shards():
+            columns = (
+                Task.objects.using(alias)
+                .annotate(rank_length=Length('rank'))
+                .filter(rank_length__gt=options['max_length'])
+                .order_by()
+                .values_list('project_id', 'status')
+                .distinct()
+            )
+            for project_id, status in columns:
+                Task.rebalance_ranks(project_id, status, using=alias)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {count} column(s).'))
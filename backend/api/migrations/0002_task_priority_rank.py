@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-19 19:18
+
+from django.db import migrations, models
+
+
+PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3}
+
+
+def backfill_priority_rank(apps, schema_editor):
+    Task = apps.get_model('api', 'Task')
+    db_alias = schema_editor.connection.alias
+    for priority, rank in PRIORITY_RANKS.items():
+        Task.objects.using(db_alias).filter(priority=priority).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, help_text='Numeric priority (low < medium < high), kept in sync with priority for ordering'),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'priority_rank', 'created_at'], name='api_task_project_bb8a36_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.27 on 2026-10-19 19:21
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+# Frozen copy of api.ranking.sequential_keys as of this migration, so later
+# changes to the key format do not change what the backfill writes.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+POSITIVE_HEADS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def sequential_keys(count):
+    """Return `count` ascending keys: a0..az, b00..bzz, and so on."""
+    keys = []
+    head, body = 0, [0]
+    for _ in range(count):
+        keys.append(POSITIVE_HEADS[head] + ''.join(DIGITS[digit] for digit in body))
+        for i in reversed(range(len(body))):
+            if body[i] + 1 < len(DIGITS):
+                body[i] += 1
+                break
+            body[i] = 0
+        else:
+            head += 1
+            body = [0] * (head + 1)
+    return keys
+
+
+def backfill_rank(apps, schema_editor):
+    """Rank existing tasks oldest first within each status column."""
+    Task = apps.get_model('api', 'Task')
+    db_alias = schema_editor.connection.alias
+    tasks = (
+        Task.objects.using(db_alias).order_by('project_id', 'status', 'created_at', 'id')
+        .only('id', 'project_id', 'status', 'rank')
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for _, column in groupby(tasks, key=lambda task: (task.project_id, task.status)):
+        column = list(column)
+        for task, rank in zip(column, sequential_keys(len(column))):
+            task.rank = rank
+            batch.append(task)
+        if len(batch) >= 2000:
+            Task.objects.using(db_alias).bulk_update(batch, ['rank'])
+            batch = []
+    if batch:
+        Task.objects.using(db_alias).bulk_update(batch, ['rank'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_task_priority_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Lexicographic position of the task within its status column', max_length=255),
+        ),
+        migrations.RunPython(backfill_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'rank'], name='api_task_project_5f61a9_idx'),
+        ),
+    ]
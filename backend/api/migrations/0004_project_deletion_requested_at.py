@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_task_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the project was queued for background deletion', null=True),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.27 on 2026-10-19 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SHARDED_TABLES = ['api_project', 'api_task']
+# Frozen copy of api.sharding.ID_BLOCK_SIZE as of this migration.
+ID_BLOCK_SIZE = 2 ** 48
+
+
+def start_id_ranges(apps, schema_editor):
+    """Move each shard's id sequences into the primary key block reserved for it."""
+    connection = schema_editor.connection
+    if connection.alias == 'default' or connection.alias not in settings.TASK_SHARDS:
+        return
+    start = (settings.TASK_SHARDS.index(connection.alias) + 1) * ID_BLOCK_SIZE
+    with connection.cursor() as cursor:
+        for table in SHARDED_TABLES:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"GREATEST(%s, (SELECT COALESCE(MAX(id), 0) FROM {table})))",
+                    [start],
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+                current = cursor.fetchone()[0]
+                cursor.execute('DELETE FROM sqlite_sequence WHERE name = %s', [table])
+                cursor.execute(
+                    'INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)',
+                    [table, max(start, current)],
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0005_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='owner',
+            field=models.ForeignKey(db_constraint=False, help_text='The user who owns this project', on_delete=django.db.models.deletion.CASCADE, related_name='projects', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(start_id_ranges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """Refuse to build the unique index while users still share an email."""
+    User = apps.get_model('auth', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+    duplicates = list(
+        users.exclude(email='').values('email')
+        .annotate(users=Count('id')).filter(users__gt=1)
+        .values_list('email', flat=True)[:20]
+    )
+    if duplicates:
+        user_ids = sorted(users.filter(email__in=duplicates).values_list('id', flat=True))
+        raise RuntimeError(
+            "Cannot make user emails unique: some non-blank emails belong to "
+            f"more than one user (user ids {user_ids}, up to 20 emails shown). "
+            "Give those users distinct or blank emails and run migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('api', '0006_shard_id_ranges'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        # auth.User belongs to Django, so enforce unique non-blank emails with
+        # a partial index; it also serves the signup uniqueness lookup.
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX api_auth_user_email_uniq ON auth_user (email) WHERE email <> ''",
+            reverse_sql='DROP INDEX api_auth_user_email_uniq',
+        ),
+    ]
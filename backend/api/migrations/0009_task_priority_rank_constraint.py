@@ -0,0 +1,58 @@
+# Generated by Django 4.2.27 on 2026-10-19 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of Task.PRIORITY_RANKS and api.sharding.ID_BLOCK_SIZE as of
+# this migration.
+PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3}
+ID_BLOCK_SIZE = 2 ** 48
+
+
+def resync_priority_rank(apps, schema_editor):
+    """Fix ranks left stale by bulk_create() or update() before the constraint existed."""
+    Task = apps.get_model('api', 'Task')
+    db_alias = schema_editor.connection.alias
+    for priority, rank in PRIORITY_RANKS.items():
+        Task.objects.using(db_alias).filter(priority=priority).exclude(
+            priority_rank=rank
+        ).update(priority_rank=rank)
+
+
+def restore_sqlite_id_range(apps, schema_editor):
+    """
+    Put a shard's task ids back in its block after SQLite rebuilds the table.
+
+    Adding a constraint on SQLite copies api_task into a new table, which
+    resets its AUTOINCREMENT counter; PostgreSQL keeps its sequence.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or connection.alias not in settings.TASK_SHARDS:
+        return
+    if connection.alias == 'default':
+        return
+    start = (settings.TASK_SHARDS.index(connection.alias) + 1) * ID_BLOCK_SIZE
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM api_task')
+        current = cursor.fetchone()[0]
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'api_task'")
+        cursor.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('api_task', %s)",
+            [max(start, current)],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_task_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(resync_priority_rank, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('priority', 'low'), ('priority_rank', 1)), models.Q(('priority', 'medium'), ('priority_rank', 2)), models.Q(('priority', 'high'), ('priority_rank', 3)), _connector='OR'), name='api_task_priority_rank_matches_priority'),
+        ),
+        migrations.RunPython(restore_sqlite_id_range, migrations.RunPython.noop),
+    ]
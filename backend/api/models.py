@@ -1,5 +1,8 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .ranking import key_between, sequential_keys
 
 
 class Project(models.Model):
@@ -9,6 +12,7 @@ class Project(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='projects',
+        db_constraint=False,
         help_text='The user who owns this project'
     )
     name = models.CharField(
@@ -24,15 +28,55 @@ class Project(models.Model):
         auto_now_add=True,
         help_text='When the project was created'
     )
+    deletion_requested_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text='When the project was queued for background deletion'
+    )
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Project'
         verbose_name_plural = 'Projects'
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
 
     def __str__(self):
         return self.name
 
+    def has_many_tasks(self):
+        """Return True if the project is too large to delete within a request."""
+        threshold = settings.PROJECT_ASYNC_DELETE_THRESHOLD
+        if threshold is None:
+            return False
+        count = self.tasks.all()[:threshold + 1].count()
+        if count <= threshold:
+            count += self.archived_tasks.all()[:threshold + 1 - count].count()
+        return count > threshold
+
+    def request_deletion(self):
+        """Hide the project and queue it for the purge_deleted_projects command."""
+        self.deletion_requested_at = timezone.now()
+        self.save(update_fields=['deletion_requested_at'])
+
+    def purge(self, chunk_size=None):
+        """
+        Delete the project, removing its tasks in bounded chunks first.
+
+        Each chunk is a separate short statement keyed by primary key, so
+        locks stay brief and memory use does not grow with the project.
+        """
+        chunk_size = chunk_size or settings.PROJECT_DELETE_CHUNK_SIZE
+        for tasks in (self.tasks, self.archived_tasks):
+            while True:
+                ids = list(tasks.order_by().values_list('pk', flat=True)[:chunk_size])
+                if not ids:
+                    break
+                tasks.filter(pk__in=ids).delete()
+        self.delete()
+
 
 class Task(models.Model):
     """Task model representing a task within a project."""
@@ -47,6 +91,12 @@ class Task(models.Model):
         MEDIUM = 'medium', 'Medium'
         HIGH = 'high', 'High'
 
+    PRIORITY_RANKS = {
+        Priority.LOW: 1,
+        Priority.MEDIUM: 2,
+        Priority.HIGH: 3,
+    }
+
     project = models.ForeignKey(
         Project,
         on_delete=models.CASCADE,
@@ -74,6 +124,18 @@ class Task(models.Model):
         default=Priority.MEDIUM,
         help_text='Priority level of the task'
     )
+    priority_rank = models.PositiveSmallIntegerField(
+        default=2,
+        editable=False,
+        help_text='Numeric priority (low < medium < high), kept in sync with priority for ordering'
+    )
+    rank = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Lexicographic position of the task within its status column'
+    )
     due_date = models.DateField(
         blank=True,
         null=True,
@@ -95,7 +157,190 @@ class Task(models.Model):
         indexes = [
             models.Index(fields=['project', 'status']),
             models.Index(fields=['project', 'priority']),
+            models.Index(fields=['project', 'priority_rank', 'created_at']),
+            models.Index(fields=['project', 'status', 'rank']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status='done'),
+                name='api_task_done_updated_idx',
+            ),
+        ]
+        constraints = [
+            # Must match PRIORITY_RANKS. save() keeps priority_rank in sync,
+            # but bulk_create() and update() bypass it, so fail loudly there.
+            models.CheckConstraint(
+                check=(
+                    models.Q(priority='low', priority_rank=1)
+                    | models.Q(priority='medium', priority_rank=2)
+                    | models.Q(priority='high', priority_rank=3)
+                ),
+                name='api_task_priority_rank_matches_priority',
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.project.name})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status so save() can tell when the task changes column."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Keep priority_rank in sync with priority and rank tasks last in their column.
+
+        New tasks, and tasks whose status changed without an explicit
+        place() into the new column, go to the end of that column.
+        """
+        self.priority_rank = self.PRIORITY_RANKS[self.priority]
+        update_fields = kwargs.get('update_fields')
+        changed_column = (
+            getattr(self, '_saved_status', None) not in (None, self.status)
+            and getattr(self, '_placed_status', None) != self.status
+            and (update_fields is None or 'status' in update_fields)
+        )
+        if (self._state.adding and not self.rank) or changed_column:
+            self.place()
+        if update_fields is not None:
+            extra = set()
+            if 'priority' in update_fields:
+                extra.add('priority_rank')
+            if changed_column:
+                extra.add('rank')
+            if extra:
+                kwargs['update_fields'] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+        self._saved_status = self.status
+        self._placed_status = None
+
+    def _column(self):
+        """Return the other tasks sharing this task's status column."""
+        return Task.objects.using(self._state.db).filter(
+            project_id=self.project_id, status=self.status
+        ).exclude(pk=self.pk)
+
+    def place(self, after=None, before=None):
+        """
+        Set rank so the task sits between `after` and `before` in its column.
+
+        With a single neighbour the task is placed directly next to it, and
+        with none it goes to the end of the column. Only this task's rank is
+        changed; the column is rebalanced first if no usable key exists.
+        """
+        for attempt in range(2):
+            column = self._column()
+            lower = after.rank if after is not None else None
+            upper = before.rank if before is not None else None
+            if after is not None and before is None:
+                upper = column.filter(rank__gt=lower).order_by('rank').values_list('rank', flat=True).first()
+            elif before is not None and after is None:
+                lower = column.filter(rank__lt=upper).order_by('-rank').values_list('rank', flat=True).first()
+            elif after is None and before is None:
+                lower = column.order_by('-rank').values_list('rank', flat=True).first()
+            try:
+                rank = key_between(lower, upper)
+            except ValueError:
+                rank = None
+            if rank is not None and len(rank) <= self._meta.get_field('rank').max_length:
+                self.rank = rank
+                self._placed_status = self.status
+                return
+            if attempt == 0:
+                Task.rebalance_ranks(self.project_id, self.status, using=self._state.db)
+                for neighbour in (after, before):
+                    if neighbour is not None:
+                        neighbour.refresh_from_db(fields=['rank'])
+        raise ValueError("Could not find a rank between the given tasks.")
+
+    @classmethod
+    def rebalance_ranks(cls, project_id, status, using=None):
+        """Rewrite the ranks of one status column with short sequential keys."""
+        using = using or router.db_for_write(cls)
+        with transaction.atomic(using=using):
+            tasks = list(
+                cls.objects.using(using).select_for_update()
+                .filter(project_id=project_id, status=status)
+                .order_by('rank', 'id')
+                .only('id', 'rank')
+            )
+            for task, rank in zip(tasks, sequential_keys(len(tasks))):
+                task.rank = rank
+            cls.objects.using(using).bulk_update(tasks, ['rank'], batch_size=1000)
+
+    @classmethod
+    def archive_done(cls, before, chunk_size=1000, using=None):
+        """
+        Move done tasks last updated before `before` into ArchivedTask.
+
+        Each chunk is copied and deleted in its own transaction, so the
+        tasks table only shrinks and a failure never loses a task. Returns
+        the number of tasks archived.
+        """
+        using = using or router.db_for_write(cls)
+        archived = 0
+        while True:
+            with transaction.atomic(using=using):
+                tasks = list(
+                    cls.objects.using(using).select_for_update()
+                    .filter(status=cls.Status.DONE, updated_at__lt=before)
+                    .order_by('updated_at')[:chunk_size]
+                )
+                if not tasks:
+                    return archived
+                archived_at = timezone.now()
+                ArchivedTask.objects.using(using).bulk_create(
+                    [ArchivedTask.from_task(task, archived_at) for task in tasks]
+                )
+                cls.objects.using(using).filter(pk__in=[task.pk for task in tasks]).delete()
+            archived += len(tasks)
+
+
+class ArchivedTask(models.Model):
+    """
+    A done task moved out of the tasks table by `Task.archive_done`.
+
+    Fields mirror Task, in the same order, so the two tables can be queried
+    together with a union. Archived tasks keep their id and are read-only.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='archived_tasks',
+        help_text='The project this task belonged to'
+    )
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Task.Status.choices)
+    priority = models.CharField(max_length=10, choices=Task.Priority.choices)
+    priority_rank = models.PositiveSmallIntegerField()
+    rank = models.CharField(max_length=255, blank=True, default='')
+    due_date = models.DateField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(
+        help_text='When the task was moved to the archive'
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived task'
+        verbose_name_plural = 'Archived tasks'
+        indexes = [
+            models.Index(fields=['project', 'created_at']),
+            models.Index(fields=['archived_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.project.name})"
+
+    @classmethod
+    def from_task(cls, task, archived_at):
+        """Return an unsaved archive copy of `task`."""
+        values = {field.attname: getattr(task, field.attname) for field in Task._meta.concrete_fields}
+        return cls(archived_at=archived_at, **values)
@@ -10,7 +10,7 @@ class IsProjectOwner(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         """Check if the user is the owner of the project."""
-        return obj.owner == request.user
+        return obj.owner_id == request.user.id
 
 
 class IsTaskProjectOwner(permissions.BasePermission):
@@ -22,5 +22,5 @@ class IsTaskProjectOwner(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         """Check if the user is the owner of the task's project."""
-        return obj.project.owner == request.user
+        return obj.project.owner_id == request.user.id
 
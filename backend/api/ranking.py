@@ -0,0 +1,144 @@
+"""Lexicographic rank keys for manual task ordering.
+
+A key is an integer part followed by an optional fraction, built from
+DIGITS so that plain string comparison gives the intended order. The first
+character of the integer part encodes its length, which keeps appends at
+the end of a column to short integer increments, while inserts between two
+neighbours extend the fraction. Either way a move only writes one new key.
+Fractions never end in the smallest digit, so there is always room to
+insert before any key.
+"""
+
+# Digits and lowercase letters only: these compare the same way under
+# byte-wise and locale-aware database collations.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Integer heads: 'a'..'z' hold 1..26 digit non-negative integers, '9'..'1'
+# hold 1..9 digit negative ones, so longer negatives sort further down.
+POSITIVE_HEADS = 'abcdefghijklmnopqrstuvwxyz'
+NEGATIVE_HEADS = '123456789'
+HEADS = NEGATIVE_HEADS + POSITIVE_HEADS
+ZERO = 'a0'
+SMALLEST_INTEGER = NEGATIVE_HEADS[0] + DIGITS[0] * len(NEGATIVE_HEADS)
+
+
+def _integer_length(head):
+    """Return the length of the integer part, head included."""
+    if head in POSITIVE_HEADS:
+        return POSITIVE_HEADS.index(head) + 2
+    if head in NEGATIVE_HEADS:
+        return len(NEGATIVE_HEADS) - NEGATIVE_HEADS.index(head) + 1
+    raise ValueError(f"Invalid rank head {head!r}.")
+
+
+def _split(key):
+    """Split a key into its integer part and fraction, validating both."""
+    if not key:
+        raise ValueError("Rank key must not be empty.")
+    length = _integer_length(key[0])
+    integer, fraction = key[:length], key[length:]
+    if len(integer) < length or any(c not in DIGITS for c in key):
+        raise ValueError(f"Invalid rank key {key!r}.")
+    if key == SMALLEST_INTEGER or fraction.endswith(DIGITS[0]):
+        raise ValueError(f"Invalid rank key {key!r}.")
+    return integer, fraction
+
+
+def _increment(integer):
+    """Return the next integer part, or None when the key space is exhausted."""
+    head, body = integer[0], list(integer[1:])
+    for i in reversed(range(len(body))):
+        digit = DIGITS.index(body[i]) + 1
+        if digit < BASE:
+            body[i] = DIGITS[digit]
+            return head + ''.join(body)
+        body[i] = DIGITS[0]
+    if head == HEADS[-1]:
+        return None
+    head = HEADS[HEADS.index(head) + 1]
+    return head + DIGITS[0] * (_integer_length(head) - 1)
+
+
+def _decrement(integer):
+    """Return the previous integer part, or None below the smallest integer."""
+    head, body = integer[0], list(integer[1:])
+    for i in reversed(range(len(body))):
+        digit = DIGITS.index(body[i]) - 1
+        if digit >= 0:
+            body[i] = DIGITS[digit]
+            return head + ''.join(body)
+        body[i] = DIGITS[-1]
+    if head == HEADS[0]:
+        return None
+    head = HEADS[HEADS.index(head) - 1]
+    return head + DIGITS[-1] * (_integer_length(head) - 1)
+
+
+def _midpoint(a, b):
+    """Return a fraction strictly between a and b (b of None means no upper bound)."""
+    if b is not None:
+        # Skip the shared prefix, treating a missing digit in a as the smallest digit.
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(lower=None, upper=None):
+    """
+    Return a rank key that sorts after `lower` and before `upper`.
+
+    Either bound may be None (or empty) to mean the start or the end of the
+    column respectively. Raises ValueError for malformed or unordered keys.
+    """
+    if lower and upper and lower >= upper:
+        raise ValueError(f"Rank {lower!r} must sort before {upper!r}.")
+
+    if not lower and not upper:
+        return ZERO
+
+    if not lower:
+        integer, fraction = _split(upper)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint('', fraction)
+        if fraction:
+            return integer
+        previous = _decrement(integer)
+        if previous == SMALLEST_INTEGER:
+            return previous + _midpoint('', None)
+        return previous
+
+    integer, fraction = _split(lower)
+    if not upper:
+        following = _increment(integer)
+        if following is None:
+            return integer + _midpoint(fraction, None)
+        return following
+
+    upper_integer, upper_fraction = _split(upper)
+    if integer == upper_integer:
+        return integer + _midpoint(fraction, upper_fraction)
+    following = _increment(integer)
+    if following is not None and following < upper:
+        return following
+    return integer + _midpoint(fraction, None)
+
+
+def sequential_keys(count):
+    """Return `count` short ascending keys, used when rebalancing a column."""
+    keys = []
+    key = ZERO
+    for _ in range(count):
+        keys.append(key)
+        key = _increment(key)
+    return keys
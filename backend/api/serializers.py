@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from .hashing import make_password
 from .models import Project, Task
 
 
@@ -19,22 +22,104 @@ class TaskSerializer(serializers.ModelSerializer):
     """Serializer for Task model."""
     
     project_name = serializers.ReadOnlyField(source='project.name')
+    archived_at = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
         fields = [
             'id', 'project', 'project_name', 'title', 'description',
-            'status', 'priority', 'due_date', 'created_at', 'updated_at'
+            'status', 'priority', 'rank', 'due_date', 'created_at', 'updated_at',
+            'archived_at'
         ]
-        read_only_fields = ['id', 'project_name', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'project_name', 'rank', 'created_at', 'updated_at']
 
     def validate_project(self, value):
         """Ensure the project belongs to the authenticated user."""
         user = self.context['request'].user
-        if value.owner != user:
+        if value.owner_id != user.id:
             raise serializers.ValidationError(
                 "You can only create tasks for your own projects."
             )
+        if value.deletion_requested_at is not None:
+            raise serializers.ValidationError("This project is being deleted.")
+        return value
+
+    def get_archived_at(self, obj):
+        """Return when the task was archived, or None for active tasks."""
+        archived_at = getattr(obj, 'archived_at', None)
+        return serializers.DateTimeField().to_representation(archived_at) if archived_at else None
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Serializer for moving a task to a new position on the board."""
+
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    after = serializers.PrimaryKeyRelatedField(
+        queryset=Task.objects.none(),
+        required=False,
+        allow_null=True,
+        help_text='Task to place this one directly after'
+    )
+    before = serializers.PrimaryKeyRelatedField(
+        queryset=Task.objects.none(),
+        required=False,
+        allow_null=True,
+        help_text='Task to place this one directly before'
+    )
+
+    def __init__(self, *args, **kwargs):
+        """Only accept neighbours from the tasks the requesting view can see."""
+        super().__init__(*args, **kwargs)
+        view = self.context.get('view')
+        if view is not None:
+            for field in ('after', 'before'):
+                self.fields[field].queryset = view.get_queryset()
+
+    def validate(self, attrs):
+        """Ensure neighbours are other tasks in the target column, in order."""
+        task = self.instance
+        target_status = attrs.get('status', task.status)
+        for field in ('after', 'before'):
+            neighbour = attrs.get(field)
+            if neighbour is None:
+                continue
+            if neighbour.pk == task.pk:
+                raise serializers.ValidationError({field: "A task cannot be moved next to itself."})
+            if neighbour.project_id != task.project_id or neighbour.status != target_status:
+                raise serializers.ValidationError(
+                    {field: "Must be a task in the same project and status column."}
+                )
+        after, before = attrs.get('after'), attrs.get('before')
+        if after is not None and before is not None and after.rank > before.rank:
+            raise serializers.ValidationError("'after' must come before 'before' in the column.")
+        return attrs
+
+    def update(self, instance, validated_data):
+        """Move the task, writing only its own row."""
+        instance.status = validated_data.get('status', instance.status)
+        instance.place(
+            after=validated_data.get('after'),
+            before=validated_data.get('before'),
+        )
+        instance.save(update_fields=['status', 'rank', 'updated_at'])
+        return instance
+
+
+class BatchSerializer(serializers.Serializer):
+    """Serializer for a batch of read-only API requests."""
+
+    requests = serializers.ListField(
+        child=serializers.CharField(max_length=2000),
+        allow_empty=False,
+        max_length=20,
+        help_text='API paths to GET, with optional query strings, e.g. /api/tasks/?project=1'
+    )
+
+    def validate_requests(self, value):
+        """Only allow paths under the API."""
+        for path in value:
+            if not path.startswith('/api/'):
+                raise serializers.ValidationError(f"{path!r} is not an API path.")
         return value
 
 
@@ -54,25 +139,39 @@ class SignupSerializer(serializers.Serializer):
         help_text='Required. Must meet password validation requirements.'
     )
     
-    def validate_username(self, value):
-        """Check that username is unique."""
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with that username already exists.")
-        return value
-    
-    def validate_email(self, value):
-        """Validate email format if provided."""
-        if value and User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with that email already exists.")
-        return value
+    def validate(self, attrs):
+        """Check that username and email are unique with a single query."""
+        username = attrs['username']
+        email = attrs.get('email')
+        condition = Q(username=username)
+        if email:
+            condition |= Q(email=email)
+        errors = {}
+        for existing_username, existing_email in User.objects.filter(condition).values_list(
+            'username', 'email'
+        ):
+            if existing_username == username:
+                errors['username'] = "A user with that username already exists."
+            if email and existing_email == email:
+                errors['email'] = "A user with that email already exists."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
     
     def create(self, validated_data):
-        """Create and return a new user with set_password."""
+        """Create and return a new user, hashing the password on the hashing pool."""
         user = User(
             username=validated_data['username'],
             email=validated_data.get('email', '')
         )
-        user.set_password(validated_data['password'])
-        user.save()
+        user.password = make_password(validated_data['password'])
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # A concurrent signup took the username or email after validation.
+            raise serializers.ValidationError(
+                "A user with that username or email already exists."
+            )
         return user
 
@@ -0,0 +1,142 @@
+"""
+Owner-based sharding of projects and tasks across several databases.
+
+Every project and task belongs to exactly one owner, and every API query is
+already scoped by owner, so each user's rows live together on the database
+alias chosen by `shard_for_owner`. Users and the rest of Django's tables
+stay on the default database.
+
+Queries are routed by `OwnerShardRouter`:
+
+- When the ORM passes an instance hint (a user, or a project/task that
+  was already loaded), the router uses that instance's shard.
+- Otherwise it uses the shard bound to the current context with
+  `use_shard`. `ShardedViewMixin` binds it for each authenticated request.
+
+Outside a request, reach an owner's rows through related managers
+(`user.projects`, `project.tasks`) or inside `use_shard(shard_for_owner(...))`;
+a bare `Project.objects` query falls back to the default database.
+
+With the default single-entry TASK_SHARDS everything routes to 'default'.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import blake2b
+
+from django.conf import settings
+
+SHARDED_APP_LABEL = 'api'
+
+# Each alias gets its own block of primary keys so rows keep their ids when
+# moved between shards; see id_range_start(). Up to 31 shards keep ids below
+# 2**53, the largest integer JavaScript clients can represent exactly.
+ID_BLOCK_SIZE = 2 ** 48
+
+_current_shard = ContextVar('current_shard', default=None)
+
+
+def _jump_hash(key, buckets):
+    """
+    Map a 64-bit key to one of `buckets` (Lamport and Veach's jump consistent hash).
+
+    Going from N to N + 1 buckets only moves about 1/(N + 1) of the keys,
+    all of them into the new bucket.
+    """
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for_owner(owner_id):
+    """Return the database alias holding the given owner's projects and tasks."""
+    shards = settings.TASK_SHARDS
+    key = int.from_bytes(blake2b(str(owner_id).encode(), digest_size=8).digest(), 'big')
+    return shards[_jump_hash(key, len(shards))]
+
+
+def all_shards():
+    """Return every alias that may hold projects and tasks, default included."""
+    return list(dict.fromkeys(['default', *settings.TASK_SHARDS]))
+
+
+def id_range_start(alias):
+    """Return the first primary key reserved for rows created on `alias`."""
+    if alias == 'default':
+        return 0
+    return (settings.TASK_SHARDS.index(alias) + 1) * ID_BLOCK_SIZE
+
+
+def get_current_shard():
+    """Return the shard bound to the current context, if any."""
+    return _current_shard.get()
+
+
+@contextmanager
+def use_shard(alias):
+    """Route unhinted project and task queries to `alias` within the block."""
+    token = _current_shard.set(alias)
+    try:
+        yield alias
+    finally:
+        _current_shard.reset(token)
+
+
+def _is_user(instance):
+    return instance._meta.label == settings.AUTH_USER_MODEL
+
+
+class OwnerShardRouter:
+    """Route project and task queries to their owner's shard."""
+
+    def _db_for_sharded_model(self, model, **hints):
+        if model._meta.app_label != SHARDED_APP_LABEL:
+            # Users and Django's own tables live on default, even when
+            # reached from a project or task loaded from a shard.
+            return 'default'
+        instance = hints.get('instance')
+        if instance is not None:
+            if _is_user(instance):
+                return shard_for_owner(instance.pk)
+            if instance._state.db:
+                return instance._state.db
+        return get_current_shard()
+
+    db_for_read = _db_for_sharded_model
+    db_for_write = _db_for_sharded_model
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow projects and tasks to reference users on the default database."""
+        labels = {obj1._meta.app_label, obj2._meta.app_label}
+        if SHARDED_APP_LABEL in labels and (_is_user(obj1) or _is_user(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Keep project and task tables on the shards.
+
+        Other apps are migrated everywhere so the api migrations can run
+        unchanged on a new shard; their tables stay empty there.
+        """
+        if app_label == SHARDED_APP_LABEL:
+            return db in all_shards()
+        return None
+
+
+class ShardedViewMixin:
+    """Bind the authenticated user's shard for the rest of the request."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _current_shard.set(get_current_shard())
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _current_shard.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.user and request.user.is_authenticated:
+            _current_shard.set(shard_for_owner(request.user.pk))
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Project
+from .sharding import shard_for_owner
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def delete_sharded_projects(sender, instance, using, **kwargs):
+    """Delete a user's projects on their shard, which the user's cascade cannot reach."""
+    shard = shard_for_owner(instance.pk)
+    if shard == using:
+        return
+    for project in Project.objects.using(shard).filter(owner_id=instance.pk).iterator():
+        project.purge()
@@ -0,0 +1,14 @@
+'use strict';
+{
+    // Apply an autocomplete list filter as soon as a value is picked or cleared.
+    django.jQuery(document).on('change', 'select.autocomplete-filter', function() {
+        const base = this.dataset.filterBase;
+        if (!this.value) {
+            window.location.search = base;
+            return;
+        }
+        const separator = base === '?' ? '' : '&';
+        window.location.search = base + separator +
+            encodeURIComponent(this.name) + '=' + encodeURIComponent(this.value);
+    });
+}
@@ -0,0 +1,17 @@
+import pytest
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Let database tests use every configured database.
+
+    With SHARD_DATABASES set, projects and tasks live on the shard
+    databases, which pytest-django otherwise blocks outside 'default'.
+    """
+    for item in items:
+        marker = item.get_closest_marker("django_db")
+        if marker is not None and "databases" not in marker.kwargs:
+            item.add_marker(
+                pytest.mark.django_db(*marker.args, **marker.kwargs, databases="__all__"),
+                append=False,
+            )
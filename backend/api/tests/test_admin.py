@@ -0,0 +1,117 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from rest_framework import status
+from api.admin import EstimatedCountPaginator
+from api.models import Project, Task
+
+
+@pytest.mark.django_db
+class TestTaskAdminChangelist:
+    """Test the task changelist on large tables."""
+
+    def setup_method(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass123"
+        )
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
+    def test_project_filter_does_not_list_every_project(self):
+        """Test that the project filter renders only the selected project."""
+        projects = [
+            Project.objects.create(owner=self.admin_user, name=f"Project {i}") for i in range(3)
+        ]
+        Task.objects.create(project=projects[0], title="First task")
+        Task.objects.create(project=projects[1], title="Second task")
+
+        response = self.client.get(
+            "/admin/api/task/", {"project__id__exact": projects[0].id}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        content = response.content.decode()
+        assert "First task" in content
+        assert "Second task" not in content
+        assert "Project 0" in content
+        assert "Project 2" not in content
+
+    def test_invalid_project_filter_redirects(self):
+        """Test that a malformed filter value is reported, not a server error."""
+
+        response = self.client.get("/admin/api/task/", {"project__id__exact": "abc"})
+
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response["Location"].endswith("?e=1")
+
+    def test_paginator_counts_exactly_without_estimate(self):
+        """Test that results are counted exactly when no planner estimate applies."""
+        project = Project.objects.create(owner=self.admin_user, name="Project")
+        Task.objects.bulk_create(Task(project=project, title=f"Task {i}") for i in range(3))
+
+        paginator = EstimatedCountPaginator(Task.objects.order_by("pk"), 2)
+
+        assert paginator.count == 3
+        assert paginator.num_pages == 2
+
+
+    def test_paginator_confirms_high_estimates(self):
+        """Test that an overestimate for a small result falls back to the exact count."""
+        project = Project.objects.create(owner=self.admin_user, name="Project")
+        Task.objects.bulk_create(Task(project=project, title=f"Task {i}") for i in range(3))
+        paginator = EstimatedCountPaginator(Task.objects.order_by("pk"), 2)
+
+        with mock.patch.object(EstimatedCountPaginator, "_estimate_count", return_value=50000):
+            assert paginator.count == 3
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="EXPLAIN estimates need PostgreSQL")
+    def test_paginator_uses_postgres_estimate_past_limit(self):
+        """Test that the EXPLAIN estimate is parsed and used once the result exceeds the limit."""
+        project = Project.objects.create(owner=self.admin_user, name="Project")
+        Task.objects.bulk_create(Task(project=project, title=f"Task {i}") for i in range(5))
+        paginator = EstimatedCountPaginator(Task.objects.order_by("pk"), 2)
+        paginator.exact_count_limit = 2
+
+        estimate = paginator._estimate_count()
+
+        assert isinstance(estimate, int)
+        # Below the limit the rows are counted; above it the capped count (3)
+        # confirms the result is large and the estimate is used.
+        expected = 5 if estimate < 2 else max(estimate, 3)
+        assert paginator.count == expected
+
+@pytest.mark.django_db
+class TestProjectAdminDelete:
+    """Test deleting projects from the admin."""
+
+    def setup_method(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="pass123"
+        )
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
+    def test_bulk_delete_queues_large_projects(self, settings):
+        """Test that "delete selected" purges small projects and queues large ones."""
+        settings.PROJECT_ASYNC_DELETE_THRESHOLD = 3
+        small = Project.objects.create(owner=self.admin_user, name="Small")
+        large = Project.objects.create(owner=self.admin_user, name="Large")
+        Task.objects.bulk_create(Task(project=large, title=f"Task {i}") for i in range(5))
+
+        response = self.client.post(
+            "/admin/api/project/",
+            {"action": "delete_selected", "_selected_action": [small.pk, large.pk], "post": "yes"},
+            follow=True,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not Project.objects.filter(pk=small.pk).exists()
+        large.refresh_from_db()
+        assert large.deletion_requested_at is not None
+        assert Task.objects.filter(project=large).count() == 5
+        assert "Queued for background deletion by purge_deleted_projects: Large." in [
+            str(message) for message in response.context["messages"]
+        ]
@@ -1,4 +1,5 @@
 import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -58,3 +59,58 @@ class TestSignup:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "username" in response.data
 
+
+    def test_signup_duplicate_email(self):
+        """Test signup with an email already in use fails."""
+        User.objects.create_user(
+            username="existing", email="taken@example.com", password="pass123"
+        )
+        client = APIClient()
+        data = {
+            "username": "newuser",
+            "email": "taken@example.com",
+            "password": "TestPass123!",
+        }
+
+        response = client.post("/api/auth/signup/", data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "email" in response.data
+        assert "username" not in response.data
+
+
+@pytest.mark.django_db
+class TestLogin:
+    """Test token login."""
+
+    def test_login_upgrades_outdated_password_hash(self):
+        """Test that logging in rehashes a password stored with old parameters."""
+        user = User.objects.create_user(username="olduser")
+        user.password = PBKDF2PasswordHasher().encode("TestPass123!", "somesalt", iterations=1000)
+        user.save()
+        client = APIClient()
+
+        response = client.post(
+            "/api/auth/token/",
+            {"username": "olduser", "password": "TestPass123!"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "access" in response.data
+        user.refresh_from_db()
+        assert not user.password.startswith("pbkdf2_sha256$1000$")
+        assert user.check_password("TestPass123!")
+
+    def test_login_wrong_password(self):
+        """Test that a wrong password is rejected."""
+        User.objects.create_user(username="user1", password="TestPass123!")
+        client = APIClient()
+
+        response = client.post(
+            "/api/auth/token/",
+            {"username": "user1", "password": "wrong"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,125 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models import Task
+from api.sharding import shard_for_owner
+from api.views import ProjectViewSet
+
+
+@pytest.mark.django_db
+class TestBatch:
+    """Test the batch endpoint."""
+
+    def setup_method(self):
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_batch_requires_auth(self):
+        """Test that the batch endpoint requires authentication."""
+        response = APIClient().post(
+            "/api/batch/", {"requests": ["/api/projects/"]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_batch_returns_results_in_order(self):
+        """Test that sub-requests run as the caller and keep their order."""
+        project = self.user.projects.create(name="My Project")
+        project.tasks.create(title="My Task")
+        other = User.objects.create_user(username="user2", password="pass123")
+        other.projects.create(name="Other Project")
+
+        response = self.client.post(
+            "/api/batch/",
+            {"requests": [
+                "/api/auth/me/",
+                "/api/projects/",
+                f"/api/tasks/?project={project.id}",
+                "/api/missing/",
+            ]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        me, projects, tasks, missing = response.data["responses"]
+        assert me["status"] == status.HTTP_200_OK
+        assert me["body"]["username"] == "user1"
+        assert [item["name"] for item in projects["body"]] == ["My Project"]
+        assert [item["title"] for item in tasks["body"]] == ["My Task"]
+        assert missing["status"] == status.HTTP_404_NOT_FOUND
+
+    def test_batch_authenticates_once_and_deduplicates(self):
+        """Test that the user is loaded once and repeated paths run once."""
+        self.user.projects.create(name="My Project")
+
+        shard = connections[shard_for_owner(self.user.pk)]
+        with CaptureQueriesContext(connection) as queries, CaptureQueriesContext(shard) as shard_queries:
+            response = self.client.post(
+                "/api/batch/",
+                {"requests": ["/api/projects/", "/api/projects/", "/api/auth/me/"]},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["responses"]) == 3
+        sqls = [query["sql"] for query in queries.captured_queries]
+        shard_sqls = [query["sql"] for query in shard_queries.captured_queries]
+        assert len([sql for sql in sqls if 'FROM "auth_user"' in sql]) == 1
+        assert len([sql for sql in shard_sqls if 'FROM "api_project"' in sql]) == 1
+
+    def test_batched_task_lists_do_not_refetch_projects(self):
+        """Test that per-project task lists load each task's project with the task."""
+        projects = [self.user.projects.create(name=f"Project {i}") for i in range(2)]
+        for project in projects:
+            project.tasks.bulk_create(Task(project=project, title=f"Task {i}") for i in range(10))
+        shard = connections[shard_for_owner(self.user.pk)]
+
+        with CaptureQueriesContext(shard) as shard_queries:
+            response = self.client.post(
+                "/api/batch/",
+                {"requests": [f"/api/tasks/?project={project.id}" for project in projects]},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [len(item["body"]) for item in response.data["responses"]] == [10, 10]
+        shard_sqls = [
+            query["sql"] for query in shard_queries.captured_queries
+            if 'FROM "auth_user"' not in query["sql"]
+        ]
+        # Per entry: the project filter validates the id, then one joined task query.
+        assert len(shard_sqls) == 4
+        assert len([sql for sql in shard_sqls if 'FROM "api_task"' in sql]) == 2
+
+    def test_batch_rejects_non_api_and_nested_paths(self):
+        """Test that only API paths can be batched, and not the batch itself."""
+        response = self.client.post(
+            "/api/batch/", {"requests": ["/admin/"]}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = self.client.post(
+            "/api/batch/", {"requests": ["/api/batch/"]}, format="json"
+        )
+        assert response.data["responses"][0]["status"] == status.HTTP_400_BAD_REQUEST
+
+    def test_batch_api_root_and_failing_entry(self):
+        """Test that the API root can be batched and a crashing entry gives a 500."""
+        with mock.patch.object(ProjectViewSet, "list", side_effect=RuntimeError("boom")):
+            response = self.client.post(
+                "/api/batch/", {"requests": ["/api/", "/api/projects/"]}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        root, projects = response.data["responses"]
+        assert root["status"] == status.HTTP_200_OK
+        assert "projects" in root["body"]
+        assert projects["status"] == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1,9 +1,14 @@
+from io import StringIO
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from api.models import Project
+from api.models import Task
 
 
 @pytest.mark.django_db
@@ -39,9 +44,9 @@ class TestProjectsIsolation:
         user2 = User.objects.create_user(username="user2", password="pass123")
 
         # Create projects for each user
-        Project.objects.create(owner=user1, name="User1 Project")
-        Project.objects.create(owner=user1, name="User1 Project 2")
-        Project.objects.create(owner=user2, name="User2 Project")
+        user1.projects.create(name="User1 Project")
+        user1.projects.create(name="User1 Project 2")
+        user2.projects.create(name="User2 Project")
 
         # Authenticate as user1
         client = APIClient()
@@ -70,6 +75,52 @@ class TestProjectsIsolation:
         assert response.data["owner"] == "user1"
 
         # Verify project was created with correct owner
-        project = Project.objects.get(name="My Project")
+        project = user.projects.get(name="My Project")
         assert project.owner == user
 
+
+
+@pytest.mark.django_db
+class TestProjectDeletion:
+    """Test deleting projects with many tasks."""
+
+    def setup_method(self):
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.project = self.user.projects.create(name="Big Project")
+        self.project.tasks.bulk_create(
+            Task(project=self.project, title=f"Task {i}", rank=f"a{i}") for i in range(5)
+        )
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_delete_removes_tasks_in_chunks_without_loading_them(self, settings):
+        """Test that tasks are deleted by primary key chunks, never fetched as rows."""
+        settings.PROJECT_DELETE_CHUNK_SIZE = 2
+
+        with CaptureQueriesContext(connections[self.project._state.db]) as queries:
+            response = self.client.delete(f"/api/projects/{self.project.id}/")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not self.user.projects.filter(pk=self.project.id).exists()
+        assert not Task.objects.using(self.project._state.db).exists()
+        task_selects = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and 'FROM "api_task"' in query["sql"]
+        ]
+        assert all('"api_task"."title"' not in sql for sql in task_selects)
+
+    def test_large_delete_is_queued(self, settings):
+        """Test that projects over the threshold are hidden and deleted later."""
+        settings.PROJECT_ASYNC_DELETE_THRESHOLD = 3
+
+        response = self.client.delete(f"/api/projects/{self.project.id}/")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert self.client.get("/api/projects/").data == []
+        assert self.client.get("/api/tasks/").data == []
+
+        call_command("purge_deleted_projects", stdout=StringIO())
+
+        assert not self.user.projects.filter(pk=self.project.id).exists()
+        assert not Task.objects.using(self.project._state.db).exists()
@@ -0,0 +1,173 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models import ArchivedTask, Project, Task
+from api.sharding import (
+    ID_BLOCK_SIZE, OwnerShardRouter, id_range_start, shard_for_owner, use_shard,
+)
+
+# Set SHARD_DATABASES to two or more database names to run the multi-database tests.
+requires_shards = pytest.mark.skipif(
+    len(settings.TASK_SHARDS) < 2,
+    reason="SHARD_DATABASES must name at least two databases",
+)
+
+
+def authenticated_client(user):
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+class TestOwnerShardRouter:
+    """Test routing decisions without touching the databases."""
+
+    @pytest.fixture(autouse=True)
+    def three_shards(self, settings):
+        settings.TASK_SHARDS = ["shard_0", "shard_1", "shard_2"]
+
+    def test_shard_for_owner_is_stable_and_spread(self):
+        """Test that owners map to a fixed shard and use every shard."""
+        shards = [shard_for_owner(owner_id) for owner_id in range(300)]
+
+        assert shards == [shard_for_owner(owner_id) for owner_id in range(300)]
+        assert set(shards) == {"shard_0", "shard_1", "shard_2"}
+
+    def test_adding_a_shard_moves_few_owners(self, settings):
+        """Test that a new shard only takes owners, about 1/(N+1) of them, from the others."""
+        before = {owner_id: shard_for_owner(owner_id) for owner_id in range(2000)}
+        settings.TASK_SHARDS = ["shard_0", "shard_1", "shard_2", "shard_3"]
+        after = {owner_id: shard_for_owner(owner_id) for owner_id in range(2000)}
+
+        moved = [owner_id for owner_id in before if before[owner_id] != after[owner_id]]
+        assert {after[owner_id] for owner_id in moved} == {"shard_3"}
+        assert 400 <= len(moved) <= 600
+
+    def test_routes_by_user_project_and_context(self):
+        """Test user hints, instance hints and the bound shard, in that order."""
+        router = OwnerShardRouter()
+        user = User(pk=7)
+        project = Project(owner_id=7)
+        project._state.db = "shard_2"
+
+        assert router.db_for_write(Project, instance=user) == shard_for_owner(7)
+        assert router.db_for_read(Task, instance=project) == "shard_2"
+        assert router.db_for_read(Task) is None
+        with use_shard("shard_1"):
+            assert router.db_for_read(Task) == "shard_1"
+            assert router.db_for_read(User, instance=project) == "default"
+
+    def test_id_ranges_do_not_overlap(self):
+        """Test that each shard starts its ids in its own block."""
+        assert id_range_start("default") == 0
+        assert id_range_start("shard_0") == ID_BLOCK_SIZE
+        assert id_range_start("shard_2") == 3 * ID_BLOCK_SIZE
+
+
+@requires_shards
+@pytest.mark.django_db(databases="__all__")
+class TestShardedApi:
+    """Test the API against several shard databases."""
+
+    def users_on_different_shards(self):
+        users = {}
+        index = 0
+        while len(users) < 2:
+            user = User.objects.create_user(username=f"user{index}", password="pass123")
+            users.setdefault(shard_for_owner(user.pk), user)
+            index += 1
+        return list(users.items())
+
+    def test_rows_are_stored_on_owner_shard(self):
+        """Test that projects and tasks land on their owner's shard only."""
+        (shard_a, user_a), (shard_b, user_b) = self.users_on_different_shards()
+        client = authenticated_client(user_a)
+
+        response = client.post("/api/projects/", {"name": "Sharded"}, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        project_id = response.data["id"]
+        response = client.post(
+            "/api/tasks/", {"project": project_id, "title": "Task"}, format="json"
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert Project.objects.using(shard_a).filter(pk=project_id).exists()
+        assert not Project.objects.using(shard_b).filter(pk=project_id).exists()
+        assert Task.objects.using(shard_a).filter(project_id=project_id).count() == 1
+        assert client.get("/api/tasks/").data[0]["project_name"] == "Sharded"
+        assert authenticated_client(user_b).get("/api/projects/").data == []
+
+    def test_rebalance_moves_owner_rows_keeping_ids(self):
+        """Test that rebalancing copies an owner's rows to the new shard."""
+        user = User.objects.create_user(username="mover", password="pass123")
+        target = shard_for_owner(user.pk)
+        with override_settings(TASK_SHARDS=["default"]):
+            project = Project.objects.create(owner=user, name="Legacy")
+            task = Task.objects.create(project=project, title="Legacy task")
+        assert project._state.db == "default"
+
+        call_command("rebalance_shards", stdout=StringIO())
+
+        assert not Project.objects.using("default").filter(pk=project.pk).exists()
+        assert Task.objects.using(target).get(pk=task.pk).project_id == project.pk
+        response = authenticated_client(user).get("/api/tasks/")
+        assert [item["id"] for item in response.data] == [task.pk]
+
+    def test_deleting_user_removes_sharded_projects(self):
+        """Test that user deletion reaches projects stored on another database."""
+        user = User.objects.create_user(username="leaver", password="pass123")
+        project = user.projects.create(name="Doomed")
+        project.tasks.create(title="Doomed task")
+        shard = project._state.db
+        assert shard == shard_for_owner(user.pk) != "default"
+
+        user.delete()
+
+        assert not Project.objects.using(shard).filter(pk=project.pk).exists()
+        assert not Task.objects.using(shard).exists()
+
+    def test_archive_runs_on_every_shard(self):
+        """Test that archiving moves done tasks into the archive on their own shard."""
+        user = User.objects.create_user(username="archiver", password="pass123")
+        project = user.projects.create(name="Old")
+        task = project.tasks.create(title="Finished", status="done")
+        shard = project._state.db
+
+        call_command("archive_done_tasks", older_than_days=-1, stdout=StringIO())
+
+        assert not Task.objects.using(shard).filter(pk=task.pk).exists()
+        assert ArchivedTask.objects.using(shard).filter(pk=task.pk).exists()
+        response = authenticated_client(user).get("/api/tasks/", {"include_archived": "true"})
+        assert [item["id"] for item in response.data] == [task.pk]
+
+    def test_admin_browses_one_shard_at_a_time(self):
+        """Test that the admin shard filter lists, edits and counts rows on the chosen shard."""
+        admin_user = User.objects.create_superuser(username="admin", password="pass123")
+        user = User.objects.create_user(username="owner", password="pass123")
+        project = user.projects.create(name="Sharded project")
+        task = project.tasks.create(title="Sharded task")
+        shard = project._state.db
+        client = Client()
+        client.force_login(admin_user)
+
+        assert "Sharded project" not in client.get("/admin/api/project/").content.decode()
+        response = client.get("/admin/api/project/", {"shard": shard})
+        assert "Sharded project" in response.content.decode()
+        response = client.get("/admin/api/task/", {"shard": shard, "project__id__exact": project.pk})
+        assert "Sharded task" in response.content.decode()
+
+        change_url = f"/admin/api/task/{task.pk}/change/?_changelist_filters=shard%3D{shard}"
+        response = client.post(change_url, {
+            "project": project.pk, "title": "Renamed", "status": "doing", "priority": "high",
+        })
+        assert response.status_code == status.HTTP_302_FOUND
+        task.refresh_from_db()
+        assert (task.title, task.priority_rank) == ("Renamed", 3)
@@ -1,9 +1,16 @@
+from datetime import timedelta
+from io import StringIO
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from api.models import Project, Task
+from api.models import ArchivedTask, Task
+from api.sharding import shard_for_owner
 
 
 @pytest.mark.django_db
@@ -12,12 +19,15 @@ class TestTaskProjectOwnership:
 
     def test_cannot_create_task_for_other_users_project(self):
         """Test that users cannot create tasks for projects they don't own."""
-        # Create two users
+        # Create two users; with several shards, other users' projects on
+        # other shards are simply not found, so keep both on one shard
         user1 = User.objects.create_user(username="user1", password="pass123")
         user2 = User.objects.create_user(username="user2", password="pass123")
+        while shard_for_owner(user2.pk) != shard_for_owner(user1.pk):
+            user2 = User.objects.create_user(username=f"user{user2.pk + 1}", password="pass123")
 
         # Create a project owned by user1
-        project = Project.objects.create(owner=user1, name="User1 Project")
+        project = user1.projects.create(name="User1 Project")
 
         # Authenticate as user2
         client = APIClient()
@@ -38,12 +48,12 @@ class TestTaskProjectOwnership:
         assert "own projects" in str(response.data["project"][0]).lower()
 
         # Verify task was not created
-        assert Task.objects.filter(title="Unauthorized Task").count() == 0
+        assert project.tasks.filter(title="Unauthorized Task").count() == 0
 
     def test_can_create_task_for_own_project(self):
         """Test that users can create tasks for their own projects."""
         user = User.objects.create_user(username="user1", password="pass123")
-        project = Project.objects.create(owner=user, name="My Project")
+        project = user.projects.create(name="My Project")
 
         client = APIClient()
         refresh = RefreshToken.for_user(user)
@@ -64,7 +74,289 @@ class TestTaskProjectOwnership:
         assert response.data["project"] == project.id
 
         # Verify task was created
-        task = Task.objects.get(title="My Task")
+        task = project.tasks.get(title="My Task")
         assert task.project == project
         assert task.project.owner == user
 
+
+
+@pytest.mark.django_db
+class TestTaskPriorityOrdering:
+    """Test ordering tasks by priority."""
+
+    def test_ordering_by_priority_uses_rank(self):
+        """Test that priority orders low < medium < high, not alphabetically."""
+        user = User.objects.create_user(username="user1", password="pass123")
+        project = user.projects.create(name="My Project")
+        for priority in ["medium", "high", "low"]:
+            project.tasks.create(title=priority, priority=priority)
+
+        client = APIClient()
+        refresh = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        response = client.get("/api/tasks/", {"ordering": "priority"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["priority"] for task in response.data] == ["low", "medium", "high"]
+
+        response = client.get("/api/tasks/", {"ordering": "-priority"})
+        assert [task["priority"] for task in response.data] == ["high", "medium", "low"]
+
+    def test_bulk_paths_cannot_leave_priority_rank_stale(self):
+        """Test that bulk writes which skip save() fail instead of storing a stale rank."""
+        user = User.objects.create_user(username="user1", password="pass123")
+        project = user.projects.create(name="My Project")
+        task = project.tasks.create(title="Task", priority="medium")
+
+        with pytest.raises(IntegrityError):
+            with transaction.atomic(using=project._state.db):
+                project.tasks.filter(pk=task.pk).update(priority="low")
+        with pytest.raises(IntegrityError):
+            with transaction.atomic(using=project._state.db):
+                project.tasks.bulk_create([Task(project=project, title="Bulk", priority="high")])
+
+    def test_priority_rank_follows_priority_updates(self):
+        """Test that changing priority keeps the stored rank in sync."""
+        user = User.objects.create_user(username="user1", password="pass123")
+        project = user.projects.create(name="My Project")
+        task = project.tasks.create(title="Task", priority="low")
+        assert task.priority_rank == 1
+
+        client = APIClient()
+        refresh = RefreshToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        response = client.patch(f"/api/tasks/{task.id}/", {"priority": "high"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        task.refresh_from_db()
+        assert task.priority_rank == 3
+
+
+@pytest.mark.django_db
+class TestTaskMove:
+    """Test manual ordering of tasks within board columns."""
+
+    def setup_method(self):
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.project = self.user.projects.create(name="My Project")
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def column(self, task_status="todo"):
+        response = self.client.get(
+            "/api/tasks/",
+            {"project": self.project.id, "status": task_status, "ordering": "rank"},
+        )
+        return [task["title"] for task in response.data]
+
+    def test_new_tasks_are_appended_to_column(self):
+        """Test that new tasks are ranked after existing ones."""
+        for title in ["a", "b", "c"]:
+            self.project.tasks.create(title=title)
+
+        assert self.column() == ["a", "b", "c"]
+
+    def test_move_between_neighbours_updates_one_row(self):
+        """Test that moving a task rewrites only the moved task's rank."""
+        a, b, c = (self.project.tasks.create(title=title) for title in "abc")
+        ranks_before = {task.pk: task.rank for task in (a, b)}
+
+        response = self.client.post(
+            f"/api/tasks/{c.id}/move/", {"after": a.id, "before": b.id}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert self.column() == ["a", "c", "b"]
+        for task in (a, b):
+            task.refresh_from_db()
+            assert task.rank == ranks_before[task.pk]
+
+    def test_move_to_other_column(self):
+        """Test moving a task into another status column next to a neighbour."""
+        a = self.project.tasks.create(title="a")
+        self.project.tasks.create(title="b", status="doing")
+        c = self.project.tasks.create(title="c", status="doing")
+
+        response = self.client.post(
+            f"/api/tasks/{a.id}/move/", {"status": "doing", "before": c.id}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "doing"
+        assert self.column("doing") == ["b", "a", "c"]
+        assert self.column("todo") == []
+
+    def test_status_update_appends_to_new_column(self):
+        """Test that changing status through a normal update ranks the task last in its new column."""
+        a = self.project.tasks.create(title="a")
+        b = self.project.tasks.create(title="b", status="doing")
+
+        response = self.client.patch(f"/api/tasks/{a.id}/", {"status": "doing"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        a.refresh_from_db()
+        b.refresh_from_db()
+        assert a.rank > b.rank
+        assert self.column("doing") == ["b", "a"]
+
+    def test_move_rejects_neighbour_from_other_column(self):
+        """Test that neighbours must be in the target column."""
+        a = self.project.tasks.create(title="a")
+        b = self.project.tasks.create(title="b", status="done")
+
+        response = self.client.post(f"/api/tasks/{a.id}/move/", {"after": b.id}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "after" in response.data
+
+    def test_move_hides_other_users_tasks(self):
+        """Test that another user's task id is rejected like a missing one."""
+        a = self.project.tasks.create(title="a")
+        other = User.objects.create_user(username="user2", password="pass123")
+        other_project = other.projects.create(name="Other")
+        theirs = other_project.tasks.create(title="theirs")
+
+        foreign = self.client.post(f"/api/tasks/{a.id}/move/", {"after": theirs.id}, format="json")
+        missing = self.client.post(f"/api/tasks/{a.id}/move/", {"after": 999999}, format="json")
+
+        assert foreign.status_code == missing.status_code == status.HTTP_400_BAD_REQUEST
+        assert foreign.data["after"] == [
+            error.replace("999999", str(theirs.id)) for error in missing.data["after"]
+        ]
+
+    def test_rebalance_command_rewrites_each_long_column_once(self):
+        """Test that rebalance_task_ranks counts columns, not over-long tasks."""
+        tasks = [self.project.tasks.create(title=title) for title in "abcde"]
+        for i, task in enumerate(tasks):
+            self.project.tasks.filter(pk=task.pk).update(rank="a0" + "1" * 30 + str(i + 1))
+        out = StringIO()
+
+        call_command("rebalance_task_ranks", stdout=out)
+
+        assert "Rebalanced 1 column(s)." in out.getvalue()
+        assert self.column() == list("abcde")
+        assert all(len(rank) <= 24 for rank in self.project.tasks.values_list("rank", flat=True))
+
+    def test_move_rebalances_tied_neighbours(self):
+        """Test that tied ranks are rebalanced so the move still succeeds."""
+        a, b, c = (self.project.tasks.create(title=title) for title in "abc")
+        self.project.tasks.filter(pk__in=[a.pk, b.pk]).update(rank="a5")
+
+        response = self.client.post(
+            f"/api/tasks/{c.id}/move/", {"after": a.id, "before": b.id}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert self.column() == ["a", "c", "b"]
+
+
+@pytest.mark.django_db
+class TestTaskArchive:
+    """Test archiving old done tasks out of the tasks table."""
+
+    def setup_method(self):
+        self.user = User.objects.create_user(username="user1", password="pass123")
+        self.project = self.user.projects.create(name="My Project")
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def create_task(self, title, task_status="todo", days_old=0):
+        task = self.project.tasks.create(title=title, status=task_status)
+        self.project.tasks.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(days=days_old))
+        return task
+
+    def archive(self, **options):
+        call_command("archive_done_tasks", stdout=StringIO(), **options)
+
+    def test_command_archives_only_old_done_tasks(self):
+        """Test that only done tasks past the age limit leave the tasks table."""
+        old_done = self.create_task("old done", "done", days_old=100)
+        self.create_task("new done", "done", days_old=1)
+        self.create_task("old todo", "todo", days_old=100)
+
+        self.archive(older_than_days=30, chunk_size=1)
+
+        assert sorted(self.project.tasks.values_list("title", flat=True)) == ["new done", "old todo"]
+        archived = self.project.archived_tasks.get()
+        assert archived.pk == old_done.pk
+        assert archived.title == "old done"
+        assert archived.created_at == old_done.created_at
+
+    def test_archived_tasks_listed_only_on_request(self):
+        """Test that ?include_archived=true adds archived tasks to the list in order."""
+        self.create_task("first", "done", days_old=100)
+        self.create_task("second")
+        self.archive(older_than_days=30)
+
+        response = self.client.get("/api/tasks/")
+        assert [task["title"] for task in response.data] == ["second"]
+
+        response = self.client.get(
+            "/api/tasks/", {"include_archived": "true", "ordering": "created_at"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in response.data] == ["first", "second"]
+        assert response.data[0]["archived_at"] is not None
+        assert response.data[1]["archived_at"] is None
+
+        response = self.client.get("/api/tasks/", {"include_archived": "true", "status": "todo"})
+        assert [task["title"] for task in response.data] == ["second"]
+
+    def test_retrieve_archived_task(self):
+        """Test that an archived task can be fetched by id with include_archived but not changed."""
+        task = self.create_task("old", "done", days_old=100)
+        self.archive(older_than_days=30)
+
+        assert self.client.get(f"/api/tasks/{task.id}/").status_code == status.HTTP_404_NOT_FOUND
+        response = self.client.get(f"/api/tasks/{task.id}/?include_archived=true")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "old"
+        response = self.client.patch(
+            f"/api/tasks/{task.id}/?include_archived=true", {"title": "new"}, format="json"
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_archive_columns_match_tasks(self):
+        """Test that ArchivedTask mirrors Task's columns in order, as the list union relies on."""
+        task_columns = [field.attname for field in Task._meta.concrete_fields]
+        archive_columns = [field.attname for field in ArchivedTask._meta.concrete_fields]
+
+        assert archive_columns == [*task_columns, "archived_at"]
+
+    def test_archive_conflict_keeps_task(self):
+        """Test that an id already in the archive rolls the chunk back instead of dropping the task."""
+        task = self.create_task("old", "done", days_old=100)
+        self.project.archived_tasks.create(
+            **{field.attname: getattr(task, field.attname) for field in Task._meta.concrete_fields
+               if field.attname != "project_id"},
+            archived_at=timezone.now(),
+        )
+
+        with pytest.raises(IntegrityError):
+            self.archive(older_than_days=30)
+
+        assert self.project.tasks.filter(pk=task.pk).exists()
+
+    def test_update_response_includes_archived_at(self):
+        """Test that archived_at is present, as null, on update responses too."""
+        task = self.create_task("open")
+
+        response = self.client.patch(f"/api/tasks/{task.id}/", {"title": "renamed"}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["archived_at"] is None
+
+    def test_archived_tasks_of_other_users_are_hidden(self):
+        """Test that include_archived only returns the user's own archived tasks."""
+        other = User.objects.create_user(username="user2", password="pass123")
+        other_project = other.projects.create(name="Other")
+        task = other_project.tasks.create(title="theirs", status="done")
+        self.archive(older_than_days=-1)
+
+        response = self.client.get("/api/tasks/", {"include_archived": "true"})
+        assert response.data == []
+        response = self.client.get(f"/api/tasks/{task.id}/?include_archived=true")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -14,5 +14,6 @@ urlpatterns = [
     path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/me/', views.me, name='me'),
+    path('batch/', views.batch, name='batch'),
     path('', include(router.urls)),
 ]
@@ -1,11 +1,24 @@
+import logging
+from urllib.parse import urlsplit
+
+from django.db.models import DateTimeField, Value
+from django.http import Http404, HttpRequest, QueryDict
+from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
 from rest_framework import viewsets, filters, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Project, Task
-from .serializers import ProjectSerializer, TaskSerializer, SignupSerializer
+from .filters import TaskOrderingFilter
+from .models import ArchivedTask, Task
+from .sharding import ShardedViewMixin
+from .serializers import (
+    BatchSerializer, ProjectSerializer, TaskSerializer, TaskMoveSerializer, SignupSerializer,
+)
 from .permissions import IsProjectOwner, IsTaskProjectOwner
 
+logger = logging.getLogger(__name__)
+
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
@@ -39,7 +52,7 @@ def signup(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ShardedViewMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing projects."""
     
     serializer_class = ProjectSerializer
@@ -47,24 +60,155 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return only projects owned by the authenticated user."""
-        return Project.objects.filter(owner=self.request.user)
+        # The related manager attaches request.user as each project's owner,
+        # so serializing owner.username needs no further query.
+        return self.request.user.projects.filter(deletion_requested_at__isnull=True)
 
     def perform_create(self, serializer):
         """Set owner to the authenticated user on create."""
         serializer.save(owner=self.request.user)
 
+    def destroy(self, request, *args, **kwargs):
+        """Delete a project, queueing large ones for background deletion."""
+        project = self.get_object()
+        if project.has_many_tasks():
+            project.request_deletion()
+            return Response(status=status.HTTP_202_ACCEPTED)
+        project.purge()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ShardedViewMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing tasks."""
     
     serializer_class = TaskSerializer
     permission_classes = [IsTaskProjectOwner]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, TaskOrderingFilter]
     filterset_fields = ['project', 'status', 'priority']
     search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority']
+    ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority', 'rank']
     ordering = ['-created_at']
 
     def get_queryset(self):
         """Return only tasks from projects owned by the authenticated user."""
-        return Task.objects.filter(project__owner=self.request.user)
+        # A task is always stored on its project's shard, so the join is
+        # safe and project_name needs no query per task.
+        return Task.objects.filter(
+            project__owner=self.request.user,
+            project__deletion_requested_at__isnull=True,
+        ).select_related('project')
+
+    def get_archived_queryset(self):
+        """Return archived tasks from projects owned by the authenticated user."""
+        return ArchivedTask.objects.filter(
+            project__owner=self.request.user,
+            project__deletion_requested_at__isnull=True,
+        )
+
+    def include_archived(self):
+        """Return True if the request asked for archived tasks with ?include_archived=true."""
+        return self.request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+    def list(self, request, *args, **kwargs):
+        """List tasks, adding archived ones in the same ordering when requested."""
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+
+        def filtered(queryset):
+            for backend in self.filter_backends:
+                if not issubclass(backend, filters.OrderingFilter):
+                    queryset = backend().filter_queryset(request, queryset, self)
+            # Both sides of the union must select the same plain columns.
+            return queryset.select_related(None).order_by()
+
+        active = filtered(self.get_queryset()).annotate(
+            archived_at=Value(None, output_field=DateTimeField())
+        )
+        # ArchivedTask mirrors Task's columns with archived_at last, matching
+        # the annotation, so the union yields Task rows from both tables.
+        tasks = active.union(filtered(self.get_archived_queryset()), all=True)
+        tasks = TaskOrderingFilter().filter_queryset(request, tasks, self)
+        return Response(self.get_serializer(tasks, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return a task, looking in the archive too when requested."""
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            if not self.include_archived():
+                raise
+        task = get_object_or_404(self.get_archived_queryset(), pk=kwargs['pk'])
+        self.check_object_permissions(request, task)
+        return Response(self.get_serializer(task).data)
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """Move a task within or between status columns."""
+        task = self.get_object()
+        serializer = TaskMoveSerializer(task, data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(self.get_serializer(task).data)
+
+
+def _batched_get(request, path):
+    """Run one GET sub-request of a batch as the already authenticated user."""
+    url = urlsplit(path)
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return {'path': path, 'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+    if match.url_name == 'batch':
+        return {
+            'path': path,
+            'status': status.HTTP_400_BAD_REQUEST,
+            'body': {'detail': 'Batches cannot be nested.'},
+        }
+
+    sub_request = HttpRequest()
+    sub_request.method = 'GET'
+    sub_request.path = sub_request.path_info = url.path
+    sub_request.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_LENGTH', 'CONTENT_TYPE')
+    }
+    sub_request.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': url.path, 'QUERY_STRING': url.query})
+    sub_request.GET = QueryDict(url.query)
+    # DRF authenticates requests carrying these with ForcedAuthentication,
+    # so the token is not decoded and the user not fetched again.
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    sub_request.resolver_match = match
+
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+    except Exception:
+        # Keep one failing sub-request from failing the whole batch.
+        logger.exception("Batched request to %s failed", path)
+        return {
+            'path': path,
+            'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'body': {'detail': 'Internal server error.'},
+        }
+    return {'path': path, 'status': response.status_code, 'body': getattr(response, 'data', None)}
+
+
+@api_view(['POST'])
+def batch(request):
+    """
+    Run several read-only API requests in one round trip.
+
+    Authentication happens once for the whole batch and identical path
+    strings are only executed once; otherwise each sub-request does its
+    own queries. Responses are returned in request order.
+    """
+    serializer = BatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    results = {}
+    for path in serializer.validated_data['requests']:
+        if path not in results:
+            results[path] = _batched_get(request, path)
+    return Response({
+        'responses': [results[path] for path in serializer.validated_data['requests']],
+    })
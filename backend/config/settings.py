@@ -101,6 +101,26 @@ DATABASES = {
     }
 }
 
+# Owner-based sharding of projects and tasks (see api/sharding.py).
+# SHARD_DATABASES lists extra database names on the same server; each becomes
+# a shard_<n> alias. Only append to this list: a shard's position fixes its
+# primary key range, and owners are hashed onto shards by position.
+# Appending a shard moves about 1/(N+1) of owners onto it. To add one:
+#   1. create the database and run `manage.py migrate --database shard_<n>`
+#      with the new SHARD_DATABASES;
+#   2. `manage.py rebalance_shards --dry-run` lists the owners that will move;
+#   3. deploy the new SHARD_DATABASES and run `manage.py rebalance_shards`
+#      straight away. Until it finishes, moved owners see an empty account
+#      and new writes land on the new shard, so do this in a quiet period.
+#      Rerunning the command is safe.
+_shard_databases = [
+    name.strip() for name in os.getenv('SHARD_DATABASES', '').split(',') if name.strip()
+]
+for _index, _name in enumerate(_shard_databases):
+    DATABASES[f'shard_{_index}'] = {**DATABASES['default'], 'NAME': _name}
+TASK_SHARDS = [f'shard_{index}' for index in range(len(_shard_databases))] or ['default']
+DATABASE_ROUTERS = ['api.sharding.OwnerShardRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -121,6 +141,17 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+AUTHENTICATION_BACKENDS = ['api.backends.HashingPoolBackend']
+
+# Threads used for password hashing in each server process (see
+# api/hashing.py); the default splits half the cores across the
+# WEB_CONCURRENCY worker processes, leaving the rest for other requests
+_processes = max(1, int(os.getenv('WEB_CONCURRENCY', '1')))
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv('PASSWORD_HASHING_WORKERS', str(max(1, (os.cpu_count() or 2) // 2 // _processes)))
+)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -160,6 +191,19 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
+# Project deletion
+# Tasks are deleted in chunks of this many rows before the project itself
+PROJECT_DELETE_CHUNK_SIZE = int(os.getenv('PROJECT_DELETE_CHUNK_SIZE', '5000'))
+# Projects with more tasks than this are queued for background deletion
+# (run `manage.py purge_deleted_projects`); set empty to always delete inline
+_async_delete_threshold = os.getenv('PROJECT_ASYNC_DELETE_THRESHOLD', '10000')
+PROJECT_ASYNC_DELETE_THRESHOLD = int(_async_delete_threshold) if _async_delete_threshold else None
+
+# Task archival
+# `manage.py archive_done_tasks` moves done tasks not updated for this many
+# days out of the tasks table; they stay readable with ?include_archived=true
+TASK_ARCHIVE_AFTER_DAYS = int(os.getenv('TASK_ARCHIVE_AFTER_DAYS', '90'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 